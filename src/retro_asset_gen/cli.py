@@ -11,9 +11,11 @@ Workflow:
 3. Run: retro-asset-gen deploy [platform_id] --theme colorful
 """
 
+import os
 import shutil
 from pathlib import Path
 
+import PIL
 import typer
 from rich.console import Console
 from rich.panel import Panel
@@ -34,6 +36,25 @@ app = typer.Typer(
 )
 console = Console()
 
+# Logo variant directories, matching the theme structure
+LOGO_VARIANTS = ("Dark - Black", "Dark - Color", "Light - Color", "Light - White")
+
+
+def _png_stems(directory: Path) -> set[str]:
+    """List the PNG file stems in a directory with a single scandir pass.
+
+    Returns an empty set if the directory does not exist.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return {
+                entry.name[:-4]
+                for entry in entries
+                if entry.name.endswith(".png") and entry.is_file()
+            }
+    except FileNotFoundError:
+        return set()
+
 
 # =============================================================================
 # GENERATE COMMAND
@@ -78,7 +99,7 @@ def generate(
         raise typer.Exit(1) from None
 
     # Check if device already exists (unless force)
-    device_path = settings.output_dir / "assets" / "images" / "devices" / f"{platform_id}.png"
+    device_path = settings.devices_dir / f"{platform_id}.png"
     if device_path.exists() and not force:
         console.print(f"[yellow]Assets for '{platform_id}' already exist.[/yellow]")
         console.print("Use --force to regenerate.")
@@ -106,12 +127,15 @@ def generate(
     info.add_row("Platform ID:", platform_id)
     info.add_row("Platform Name:", platform_name)
     info.add_row("Input:", str(settings.get_input_dir(platform_id)))
-    info.add_row("Output:", str(settings.output_dir / "assets" / "images"))
+    info.add_row("Output:", str(settings.images_dir))
 
     console.print(Panel(info, title="[bold]Generating Assets[/bold]"))
 
     # Generate assets
-    result = generator.generate(platform_id, platform_name)
+    try:
+        result = generator.generate(platform_id, platform_name)
+    finally:
+        generator.close()
 
     # Print summary
     console.print()
@@ -156,12 +180,9 @@ def list_platforms() -> None:
         console.print(f"[red]Configuration error:[/red] {e}")
         raise typer.Exit(1) from None
 
-    devices_dir = settings.output_dir / "assets" / "images" / "devices"
-    if not devices_dir.exists():
-        console.print("[dim]No platforms generated yet.[/dim]")
-        return
-
-    platforms = sorted([f.stem for f in devices_dir.glob("*.png")])
+    devices_dir = settings.devices_dir
+    device_ids = _png_stems(devices_dir)
+    platforms = sorted(device_ids)
 
     if not platforms:
         console.print("[dim]No platforms generated yet.[/dim]")
@@ -172,14 +193,13 @@ def list_platforms() -> None:
     table.add_column("Device")
     table.add_column("Logos")
 
-    logos_base = settings.output_dir / "assets" / "images" / "logos"
+    # Scan each directory once instead of stat-ing every file per platform
+    logos_base = settings.logos_dir
+    logo_ids = [_png_stems(logos_base / d) for d in LOGO_VARIANTS]
 
     for platform_id in platforms:
-        device_exists = (devices_dir / f"{platform_id}.png").exists()
-        logo_count = sum(
-            1 for d in ["Dark - Black", "Dark - Color", "Light - Color", "Light - White"]
-            if (logos_base / d / f"{platform_id}.png").exists()
-        )
+        device_exists = platform_id in device_ids
+        logo_count = sum(1 for ids in logo_ids if platform_id in ids)
         table.add_row(
             platform_id,
             "[green]✓[/green]" if device_exists else "[red]✗[/red]",
@@ -245,7 +265,7 @@ def deploy(
         raise typer.Exit(1) from None
 
     # Get platforms to deploy
-    devices_dir = settings.output_dir / "assets" / "images" / "devices"
+    devices_dir = settings.devices_dir
     if not devices_dir.exists():
         console.print("[red]No generated assets found.[/red]")
         raise typer.Exit(1) from None
@@ -256,19 +276,14 @@ def deploy(
             raise typer.Exit(1) from None
         platforms = [platform_id]
     else:
-        platforms = sorted([f.stem for f in devices_dir.glob("*.png")])
+        platforms = sorted(_png_stems(devices_dir))
 
     if not platforms:
         console.print("[dim]No platforms to deploy.[/dim]")
         return
 
     # Logo directories in output
-    logo_dirs = {
-        "Dark - Black": settings.output_dir / "assets" / "images" / "logos" / "Dark - Black",
-        "Dark - Color": settings.output_dir / "assets" / "images" / "logos" / "Dark - Color",
-        "Light - Color": settings.output_dir / "assets" / "images" / "logos" / "Light - Color",
-        "Light - White": settings.output_dir / "assets" / "images" / "logos" / "Light - White",
-    }
+    logo_dirs = {name: settings.logos_dir / name for name in LOGO_VARIANTS}
 
     theme_base = Path(theme_config.base_path)
     if not theme_base.exists() and not dry_run:
@@ -390,10 +405,24 @@ def config() -> None:
     else:
         google_status = "[dim]Disabled[/dim]"
     table.add_row("Google Search", google_status)
+    if settings.enable_parallel_generation:
+        parallel_status = "[green]Enabled[/green]"
+    else:
+        parallel_status = "[dim]Disabled[/dim]"
+    table.add_row("Parallel Generation", parallel_status)
+    if settings.enable_logo_variants:
+        variants_status = "[green]Enabled[/green]"
+    else:
+        variants_status = "[dim]Disabled[/dim]"
+    table.add_row("Logo Variants", variants_status)
     table.add_row("Input Dir", str(settings.input_dir))
     table.add_row("Output Dir", str(settings.output_dir))
     table.add_row("Device Size", f"{settings.device_width}x{settings.device_height}")
     table.add_row("Logo Size", f"{settings.logo_width}x{settings.logo_height}")
+    pillow_version = PIL.__version__
+    if ".post" in pillow_version:  # Pillow-SIMD releases are numbered X.Y.Z.postN
+        pillow_version += " [green](SIMD)[/green]"
+    table.add_row("Pillow", pillow_version)
 
     console.print(table)
 
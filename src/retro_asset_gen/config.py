@@ -1,5 +1,6 @@
 """Configuration management using Pydantic Settings."""
 
+from functools import cached_property
 from pathlib import Path
 
 from pydantic import Field
@@ -18,6 +19,8 @@ class Settings(BaseSettings):
     # API Configuration
     gemini_api_key: str
     gemini_api_url: str = "https://generativelanguage.googleapis.com/v1beta/models/gemini-3-pro-image-preview:generateContent"
+    gemini_max_retries: int = Field(default=3, ge=0)  # Retries on 429/5xx overload responses
+    gemini_requests_per_minute: int = Field(default=0, ge=0)  # Client-side RPM cap (0 = unlimited)
 
     # Directories
     input_dir: Path = Field(default=Path(".input"), alias="RETRO_INPUT_DIR")
@@ -39,8 +42,26 @@ class Settings(BaseSettings):
 
     # Features
     enable_google_search: bool = True
+    enable_parallel_generation: bool = Field(default=True, alias="RETRO_PARALLEL")
+    enable_logo_variants: bool = Field(default=True, alias="RETRO_LOGO_VARIANTS")
     enable_quantization: bool = Field(default=True, alias="RETRO_QUANTIZE")
     quantization_quality: str = Field(default="65-80", alias="RETRO_QUANTIZE_QUALITY")
+    quantization_speed: int = Field(default=4, ge=1, le=10, alias="RETRO_QUANTIZE_SPEED")
+
+    @cached_property
+    def images_dir(self) -> Path:
+        """Root of the generated images, matching the theme structure."""
+        return self.output_dir / "assets" / "images"
+
+    @cached_property
+    def devices_dir(self) -> Path:
+        """Directory for generated device images."""
+        return self.images_dir / "devices"
+
+    @cached_property
+    def logos_dir(self) -> Path:
+        """Directory containing one subdirectory per logo variant."""
+        return self.images_dir / "logos"
 
     def get_input_dir(self, platform_id: str) -> Path:
         """Get input directory for a platform."""
@@ -1,12 +1,18 @@
 """Gemini API client for image generation."""
 
 import base64
+import threading
+import time
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
 import httpx
 
+# Status codes that signal overload rather than a bad request
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+
 
 class GeminiAPIError(Exception):
     """Raised when Gemini API returns an error."""
@@ -24,6 +30,68 @@ class GenerationResult:
     text_response: str | None = None
 
 
+def _parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header given in seconds."""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+class RateController:
+    """Client-side throttling driven by server feedback.
+
+    Requests go out immediately while there is headroom. They are only delayed
+    when the optional requests-per-minute window is full, or after the server
+    asked for a back-off via a throttling status code.
+    """
+
+    def __init__(self, requests_per_minute: int = 0):
+        """Initialize the controller.
+
+        Args:
+            requests_per_minute: Sliding-window request budget (0 = unlimited)
+        """
+        self.requests_per_minute = requests_per_minute
+        self._sent: deque[float] = deque()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def wait_if_throttled(self) -> None:
+        """Block until a request may be sent, reserving its slot."""
+        with self._lock:
+            now = time.monotonic()
+            delay = max(0.0, self._blocked_until - now)
+
+            if self.requests_per_minute > 0:
+                while self._sent and now - self._sent[0] >= 60.0:
+                    self._sent.popleft()
+                if len(self._sent) >= self.requests_per_minute:
+                    delay = max(delay, self._sent[0] + 60.0 - now)
+                self._sent.append(now + delay)
+
+        if delay > 0:
+            time.sleep(delay)
+
+    def back_off(self, response: httpx.Response, attempt: int) -> float:
+        """Pause all requests after a throttled response.
+
+        Honors the Retry-After header when present, otherwise backs off
+        exponentially with the attempt number.
+
+        Returns:
+            Back-off delay in seconds
+        """
+        delay = _parse_retry_after(response.headers.get("retry-after"))
+        if delay is None:
+            delay = 2.0**attempt
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+        return delay
+
+
 class GeminiClient:
     """Client for Gemini image generation API (Nano Banana Pro)."""
 
@@ -33,11 +101,22 @@ class GeminiClient:
         api_url: str,
         timeout: float = 120.0,
         enable_google_search: bool = True,
+        max_retries: int = 3,
+        requests_per_minute: int = 0,
     ):
         self.api_key = api_key
         self.api_url = api_url
         self.timeout = timeout
         self.enable_google_search = enable_google_search
+        self.max_retries = max_retries
+        self.rate_controller = RateController(requests_per_minute)
+        # Shared across requests so concurrent and consecutive calls reuse
+        # pooled TCP/TLS connections instead of reconnecting each time
+        self._http = httpx.Client(timeout=timeout)
+
+    def close(self) -> None:
+        """Close pooled HTTP connections."""
+        self._http.close()
 
     def generate_image_with_reference(
         self,
@@ -64,8 +143,7 @@ class GeminiClient:
         parts: list[dict[str, Any]] = []
 
         if reference_image_path:
-            with open(reference_image_path, "rb") as f:
-                ref_base64 = base64.b64encode(f.read()).decode("utf-8")
+            ref_base64 = base64.b64encode(reference_image_path.read_bytes()).decode("utf-8")
             parts.append({
                 "inline_data": {
                     "mime_type": "image/png",
@@ -91,48 +169,7 @@ class GeminiClient:
         if self.enable_google_search:
             request["tools"] = [{"google_search": {}}]
 
-        # Make API request
-        with httpx.Client(timeout=self.timeout) as client:
-            response = client.post(
-                self.api_url,
-                headers={
-                    "x-goog-api-key": self.api_key,
-                    "Content-Type": "application/json",
-                },
-                json=request,
-            )
-
-        if response.status_code != 200:
-            raise GeminiAPIError(
-                f"HTTP {response.status_code}: {response.text}",
-                status_code=response.status_code,
-            )
-
-        data = response.json()
-
-        if "error" in data:
-            error_msg = data["error"].get("message", str(data["error"]))
-            raise GeminiAPIError(f"API Error: {error_msg}")
-
-        if "candidates" not in data:
-            raise GeminiAPIError(f"Unexpected response format: {str(data)[:200]}")
-
-        # Extract image and text from response
-        image_data = None
-        text_response = None
-
-        for part in data["candidates"][0]["content"]["parts"]:
-            if "inlineData" in part:
-                image_data = base64.b64decode(part["inlineData"]["data"])
-            elif "text" in part:
-                text = part["text"].strip()
-                if text:
-                    text_response = text
-
-        if image_data is None:
-            raise GeminiAPIError("No image in response")
-
-        return GenerationResult(image_data=image_data, text_response=text_response)
+        return self._send(request)
 
     def edit_image(
         self,
@@ -160,8 +197,7 @@ class GeminiClient:
             GeminiAPIError: If API returns an error
         """
         # Load source image as base64
-        with open(source_image_path, "rb") as f:
-            source_base64 = base64.b64encode(f.read()).decode("utf-8")
+        source_base64 = base64.b64encode(source_image_path.read_bytes()).decode("utf-8")
 
         parts: list[dict[str, Any]] = [
             {
@@ -185,9 +221,25 @@ class GeminiClient:
             },
         }
 
-        # Make API request
-        with httpx.Client(timeout=self.timeout) as client:
-            response = client.post(
+        return self._send(request)
+
+    def _send(self, request: dict[str, Any]) -> GenerationResult:
+        """Post a request payload and extract the generated image.
+
+        Args:
+            request: JSON request payload
+
+        Returns:
+            GenerationResult with image data
+
+        Raises:
+            GeminiAPIError: If API returns an error
+        """
+        # Make API request, retrying when the server reports overload
+        response: httpx.Response | None = None
+        for attempt in range(self.max_retries + 1):
+            self.rate_controller.wait_if_throttled()
+            response = self._http.post(
                 self.api_url,
                 headers={
                     "x-goog-api-key": self.api_key,
@@ -195,6 +247,15 @@ class GeminiClient:
                 },
                 json=request,
             )
+            if (
+                response.status_code not in RETRYABLE_STATUS_CODES
+                or attempt == self.max_retries
+            ):
+                break
+            self.rate_controller.back_off(response, attempt)
+
+        if response is None:
+            raise GeminiAPIError(f"No request sent (max_retries={self.max_retries})")
 
         if response.status_code != 200:
             raise GeminiAPIError(
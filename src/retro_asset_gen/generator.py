@@ -6,7 +6,10 @@ This module handles generating platform assets from user-provided reference imag
 from __future__ import annotations
 
 import io
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
 
 from PIL import Image
@@ -15,23 +18,28 @@ from rich.console import Console
 from .config import Settings
 from .gemini_client import GeminiAPIError, GeminiClient
 from .image_processor import (
-    chroma_key_transparency,
+    chroma_key,
     create_logo_variants_theme_structure,
-    difference_matte,
-    get_image_dimensions,
+    extract_alpha,
     has_alpha_channel,
-    quantize_png,
-    resize_image,
+    quantize,
+    read_png_header,
+    resize,
+    save_quantized_png,
 )
 from .prompts import AssetPrompts, get_device_type, get_logo_type
 
+# zlib level for throwaway PNGs; level 1 encodes several times faster than the
+# default 6 at the cost of a somewhat larger file
+TEMP_PNG_COMPRESS_LEVEL = 1
 
-def save_as_png(image_data: bytes, output_path: Path) -> None:
-    """Save image data as PNG, converting from any format if necessary."""
+
+def decode_image(image_data: bytes) -> Image.Image:
+    """Decode image data from the API, normalizing any format to RGB(A)."""
     img: Image.Image = Image.open(io.BytesIO(image_data))
     if img.mode != "RGBA":
         img = img.convert("RGB")
-    img.save(output_path, "PNG")
+    return img
 
 
 @dataclass
@@ -42,6 +50,7 @@ class GeneratedAsset:
     output_path: Path
     dimensions: tuple[int, int]
     has_alpha: bool
+    quantized: bool = False
 
 
 @dataclass
@@ -78,8 +87,14 @@ class AssetGenerator:
             api_key=settings.gemini_api_key,
             api_url=settings.gemini_api_url,
             enable_google_search=settings.enable_google_search,
+            max_retries=settings.gemini_max_retries,
+            requests_per_minute=settings.gemini_requests_per_minute,
         )
 
+    def close(self) -> None:
+        """Release the API client's pooled connections."""
+        self.client.close()
+
     def verify_references(self, platform_id: str) -> list[str]:
         """Verify reference images exist for a platform.
 
@@ -118,101 +133,154 @@ class AssetGenerator:
             return result
 
         # Create output directories matching theme structure
-        base_dir = self.settings.output_dir / "assets" / "images"
-        devices_dir = base_dir / "devices"
-        logos_dark_black_dir = base_dir / "logos" / "Dark - Black"
-        logos_dark_color_dir = base_dir / "logos" / "Dark - Color"
-        logos_light_color_dir = base_dir / "logos" / "Light - Color"
-        logos_light_white_dir = base_dir / "logos" / "Light - White"
+        devices_dir = self.settings.devices_dir
+        logos_dark_black_dir = self.settings.logos_dir / "Dark - Black"
+        logos_dark_color_dir = self.settings.logos_dir / "Dark - Color"
+        logos_light_color_dir = self.settings.logos_dir / "Light - Color"
+        logos_light_white_dir = self.settings.logos_dir / "Light - White"
 
         for d in [devices_dir, logos_dark_black_dir, logos_dark_color_dir,
                   logos_light_color_dir, logos_light_white_dir]:
             d.mkdir(parents=True, exist_ok=True)
 
-        # Generate device image
-        self.console.print("\n[bold cyan]Generating device image...[/bold cyan]")
-        device_asset = self._generate_device(
+        generate_device = partial(
+            self._generate_device,
             platform_name=platform_name,
             platform_id=platform_id,
             reference_path=platform_ref,
             output_dir=devices_dir,
         )
-        if device_asset:
-            result.assets.append(device_asset)
-        else:
-            result.errors.append(("device", "Failed to generate device image"))
-
-        # Generate logo image (to temp location, then create variants)
-        self.console.print("\n[bold cyan]Generating logo image...[/bold cyan]")
-        logo_asset = self._generate_logo(
+        generate_logo = partial(
+            self._generate_logo,
             platform_name=platform_name,
             platform_id=platform_id,
             reference_path=logo_ref,
             output_dir=logos_light_color_dir,  # Base goes to Light - Color
         )
+
+        if self.settings.enable_parallel_generation:
+            # Device and logo are independent API round-trips, so overlap them.
+            # Each task buffers its progress lines, which are printed once it
+            # finishes so the two streams do not interleave
+            self.console.print(
+                "\n[bold cyan]Generating device and logo images...[/bold cyan]"
+            )
+            device_log: list[str] = []
+            logo_log: list[str] = []
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                device_future = executor.submit(generate_device, log=device_log.append)
+                logo_future = executor.submit(generate_logo, log=logo_log.append)
+                device_asset = device_future.result()
+                self.console.print("\n[bold cyan]Device image:[/bold cyan]")
+                for line in device_log:
+                    self.console.print(line)
+                logo_asset = logo_future.result()
+                self.console.print("\n[bold cyan]Logo image:[/bold cyan]")
+                for line in logo_log:
+                    self.console.print(line)
+        else:
+            self.console.print("\n[bold cyan]Generating device image...[/bold cyan]")
+            device_asset = generate_device()
+            self.console.print("\n[bold cyan]Generating logo image...[/bold cyan]")
+            logo_asset = generate_logo()
+
+        if device_asset:
+            result.assets.append(device_asset)
+        else:
+            result.errors.append(("device", "Failed to generate device image"))
+
         if logo_asset:
             result.assets.append(logo_asset)
 
             # Generate logo variants from the base logo
-            self.console.print("\n[bold cyan]Creating logo variants...[/bold cyan]")
-            try:
-                variants = create_logo_variants_theme_structure(
-                    source_color_logo=logo_asset.output_path,
-                    platform_id=platform_id,
-                    logos_dark_black_dir=logos_dark_black_dir,
-                    logos_dark_color_dir=logos_dark_color_dir,
-                    logos_light_color_dir=logos_light_color_dir,
-                    logos_light_white_dir=logos_light_white_dir,
-                )
-                for variant_name, variant_path in variants.items():
-                    dimensions = get_image_dimensions(variant_path)
-                    has_alpha = has_alpha_channel(variant_path)
-                    result.assets.append(GeneratedAsset(
-                        asset_type=variant_name,
-                        output_path=variant_path,
-                        dimensions=dimensions,
-                        has_alpha=has_alpha,
-                    ))
-                    self.console.print(
-                        f"  [green]✓[/green] {variant_path.relative_to(self.settings.output_dir)} "
-                        f"({dimensions[0]}x{dimensions[1]})"
+            if self.settings.enable_logo_variants:
+                self.console.print("\n[bold cyan]Creating logo variants...[/bold cyan]")
+                # Full-color monochrome variants go through _save_asset, so they
+                # are quantized even when the color logo itself was rejected
+                variant_quantized: dict[Path, bool] = {}
+
+                def save_variant(img: Image.Image, output_path: Path) -> None:
+                    variant_quantized[output_path] = self._save_asset(img, output_path)
+
+                try:
+                    variants = create_logo_variants_theme_structure(
+                        source_color_logo=logo_asset.output_path,
+                        platform_id=platform_id,
+                        logos_dark_black_dir=logos_dark_black_dir,
+                        logos_dark_color_dir=logos_dark_color_dir,
+                        logos_light_color_dir=logos_light_color_dir,
+                        logos_light_white_dir=logos_light_white_dir,
+                        save=save_variant,
                     )
-            except Exception as e:
-                result.errors.append(("logo_variants", str(e)))
-                self.console.print(f"  [red]✗[/red] Logo variants error: {e}")
+                    # Variants keep the base logo's size; the monochrome ones always
+                    # carry transparency, the color copy matches the base
+                    dimensions = logo_asset.dimensions
+                    for variant_name, variant_path in variants.items():
+                        result.assets.append(GeneratedAsset(
+                            asset_type=variant_name,
+                            output_path=variant_path,
+                            dimensions=dimensions,
+                            has_alpha=(
+                                logo_asset.has_alpha if variant_name == "Dark - Color" else True
+                            ),
+                            # Variants not saved here are copies or palette
+                            # recolors of the base logo
+                            quantized=variant_quantized.get(
+                                variant_path, logo_asset.quantized
+                            ),
+                        ))
+                        rel_path = variant_path.relative_to(self.settings.output_dir)
+                        self.console.print(
+                            f"  [green]✓[/green] {rel_path} ({dimensions[0]}x{dimensions[1]})"
+                        )
+                except Exception as e:
+                    result.errors.append(("logo_variants", str(e)))
+                    self.console.print(f"  [red]✗[/red] Logo variants error: {e}")
         else:
             result.errors.append(("logo", "Failed to generate logo image"))
 
-        # Quantize all generated PNGs if enabled
-        if self.settings.enable_quantization and result.assets:
-            self.console.print("\n[bold cyan]Quantizing images...[/bold cyan]")
-            total_original = 0
-            total_quantized = 0
+        # Assets were quantized in memory as they were saved; report the result
+        quantized_assets = [asset for asset in result.assets if asset.quantized]
+        if quantized_assets:
+            total_size = sum(asset.output_path.stat().st_size for asset in quantized_assets)
+            self.console.print(
+                f"\n  [dim]Total: {len(quantized_assets)} quantized images, "
+                f"{self._format_size(total_size)}[/dim]"
+            )
+
+        return result
+
+    def _save_asset(
+        self,
+        img: Image.Image,
+        output_path: Path,
+        log: Callable[[str], None] | None = None,
+    ) -> bool:
+        """Save a final asset, quantizing it in memory first when enabled.
+
+        Quantizing before the only PNG encode avoids writing a full-color PNG
+        just to decode and rewrite it.
 
-            for asset in result.assets:
-                qr = quantize_png(
-                    asset.output_path,
+        Returns:
+            True if the asset was saved quantized, False if saved in full color
+        """
+        log = log or self.console.print
+        if self.settings.enable_quantization:
+            try:
+                quantized = quantize(
+                    img,
                     quality=self.settings.quantization_quality,
+                    speed=self.settings.quantization_speed,
                 )
-                total_original += qr.original_size
-                total_quantized += qr.quantized_size
-
-                if qr.method == "pngquant" and qr.reduction_pct > 0:
-                    self.console.print(
-                        f"  [green]✓[/green] {asset.output_path.name} "
-                        f"({self._format_size(qr.original_size)} → "
-                        f"{self._format_size(qr.quantized_size)}, "
-                        f"-{qr.reduction_pct:.0f}%)"
-                    )
+            except RuntimeError as e:
+                # Quantization can fail for some images; keep full color
+                log(f"  [dim]Quantization skipped: {e}[/dim]")
+            else:
+                save_quantized_png(quantized, output_path)
+                return True
 
-            if total_original > 0:
-                total_reduction = (1 - total_quantized / total_original) * 100
-                self.console.print(
-                    f"  [dim]Total: {self._format_size(total_original)} → "
-                    f"{self._format_size(total_quantized)} (-{total_reduction:.0f}%)[/dim]"
-                )
-
-        return result
+        img.save(output_path, "PNG")
+        return False
 
     @staticmethod
     def _format_size(size_bytes: int) -> str:
@@ -230,6 +298,7 @@ class AssetGenerator:
         platform_id: str,
         reference_path: Path,
         output_dir: Path,
+        log: Callable[[str], None] | None = None,
     ) -> GeneratedAsset | None:
         """Generate device image using reference with difference matting.
 
@@ -243,35 +312,42 @@ class AssetGenerator:
             platform_id: Platform identifier for filename
             reference_path: Path to reference platform image
             output_dir: Output directory
+            log: Progress output (defaults to printing on the console)
 
         Returns:
             GeneratedAsset if successful, None otherwise
         """
+        log = log or self.console.print
         device_type = get_device_type(
             width=self.settings.device_width,
             height=self.settings.device_height,
         )
         output_path = output_dir / f"{platform_id}.png"
         white_path = output_dir / f"{platform_id}_white.png"
-        black_path = output_dir / f"{platform_id}_black.png"
         prompt = AssetPrompts.device(platform_name)
 
         try:
             # Step 1: Generate on white background
-            self.console.print("  [dim]Pass 1: Generating on white background...[/dim]")
+            log("  [dim]Pass 1: Generating on white background...[/dim]")
             white_result = self.client.generate_image_with_reference(
                 prompt=prompt,
                 reference_image_path=reference_path,
                 aspect_ratio=device_type.aspect_ratio,
                 image_size=device_type.image_size,
             )
-            save_as_png(white_result.image_data, white_path)
+            # The white render stays in memory; the file is only the edit upload.
+            # PNG responses are written through untouched instead of re-encoded
+            white_img = decode_image(white_result.image_data)
+            if read_png_header(white_result.image_data) is not None:
+                white_path.write_bytes(white_result.image_data)
+            else:
+                white_img.save(white_path, "PNG", compress_level=TEMP_PNG_COMPRESS_LEVEL)
 
             if white_result.text_response and len(white_result.text_response) < 200:
-                self.console.print(f"  [dim]Note: {white_result.text_response}[/dim]")
+                log(f"  [dim]Note: {white_result.text_response}[/dim]")
 
             # Step 2: Edit to black background
-            self.console.print("  [dim]Pass 2: Converting to black background...[/dim]")
+            log("  [dim]Pass 2: Converting to black background...[/dim]")
             edit_prompt = (
                 "Change the white background to solid pure black #000000. "
                 "Keep everything else exactly unchanged."
@@ -282,40 +358,35 @@ class AssetGenerator:
                 aspect_ratio=device_type.aspect_ratio,
                 image_size=device_type.image_size,
             )
-            save_as_png(black_result.image_data, black_path)
+            black_img = decode_image(black_result.image_data)
 
             # Step 3: Resize both images to target dimensions
-            resize_image(
-                white_path,
-                device_type.target_width,
-                device_type.target_height,
-            )
-            orig_w, orig_h, new_w, new_h = resize_image(
-                black_path,
-                device_type.target_width,
-                device_type.target_height,
-            )
-            if (orig_w, orig_h) != (new_w, new_h):
-                self.console.print(
-                    f"  [dim]Resized: {orig_w}x{orig_h} -> {new_w}x{new_h}[/dim]"
+            target_size = (device_type.target_width, device_type.target_height)
+            white_img = resize(white_img, *target_size)
+            orig_w, orig_h = black_img.size
+            black_img = resize(black_img, *target_size)
+            if black_img.size != (orig_w, orig_h):
+                log(
+                    f"  [dim]Resized: {orig_w}x{orig_h} -> "
+                    f"{target_size[0]}x{target_size[1]}[/dim]"
                 )
 
             # Step 4: Apply difference matting
-            self.console.print("  [dim]Extracting transparency via difference matting...[/dim]")
-            stats = difference_matte(white_path, black_path, output_path)
-            self.console.print(
+            log("  [dim]Extracting transparency via difference matting...[/dim]")
+            output_img, stats = extract_alpha(white_img, black_img)
+            quantized = self._save_asset(output_img, output_path, log)
+            log(
                 f"  [dim]Alpha: {stats.opaque_pct:.1f}% opaque, "
                 f"{stats.semi_transparent_pct:.1f}% semi-transparent, "
                 f"{stats.transparent_pct:.1f}% transparent[/dim]"
             )
 
-            # Step 5: Clean up temp files
+            # Step 5: Clean up temp file
             white_path.unlink(missing_ok=True)
-            black_path.unlink(missing_ok=True)
 
-            dimensions = get_image_dimensions(output_path)
-            has_alpha = has_alpha_channel(output_path)
-            self.console.print(
+            dimensions = output_img.size
+            has_alpha = has_alpha_channel(output_img)
+            log(
                 f"  [green]✓[/green] {output_path.name} "
                 f"({dimensions[0]}x{dimensions[1]})"
             )
@@ -325,19 +396,18 @@ class AssetGenerator:
                 output_path=output_path,
                 dimensions=dimensions,
                 has_alpha=has_alpha,
+                quantized=quantized,
             )
 
         except GeminiAPIError as e:
-            self.console.print(f"  [red]✗[/red] API error: {e}")
-            # Clean up temp files on error
+            log(f"  [red]✗[/red] API error: {e}")
+            # Clean up temp file on error
             white_path.unlink(missing_ok=True)
-            black_path.unlink(missing_ok=True)
             return None
         except Exception as e:
-            self.console.print(f"  [red]✗[/red] Error: {e}")
-            # Clean up temp files on error
+            log(f"  [red]✗[/red] Error: {e}")
+            # Clean up temp file on error
             white_path.unlink(missing_ok=True)
-            black_path.unlink(missing_ok=True)
             return None
 
     def _generate_logo(
@@ -346,6 +416,7 @@ class AssetGenerator:
         platform_id: str,
         reference_path: Path,
         output_dir: Path,
+        log: Callable[[str], None] | None = None,
     ) -> GeneratedAsset | None:
         """Generate logo image using reference.
 
@@ -354,10 +425,12 @@ class AssetGenerator:
             platform_id: Platform identifier for filename
             reference_path: Path to reference logo image
             output_dir: Output directory
+            log: Progress output (defaults to printing on the console)
 
         Returns:
             GeneratedAsset if successful, None otherwise
         """
+        log = log or self.console.print
         logo_type = get_logo_type(
             width=self.settings.logo_width,
             height=self.settings.logo_height,
@@ -373,30 +446,30 @@ class AssetGenerator:
                 image_size=logo_type.image_size,
             )
 
-            # Save image as PNG (converting if necessary)
-            save_as_png(result.image_data, output_path)
+            # Decode once and post-process in memory (converting if necessary)
+            img = decode_image(result.image_data)
 
             if result.text_response and len(result.text_response) < 200:
-                self.console.print(f"  [dim]Note: {result.text_response}[/dim]")
+                log(f"  [dim]Note: {result.text_response}[/dim]")
 
             # Resize to exact dimensions
-            orig_w, orig_h, new_w, new_h = resize_image(
-                output_path,
-                logo_type.target_width,
-                logo_type.target_height,
-            )
+            orig_w, orig_h = img.size
+            img = resize(img, logo_type.target_width, logo_type.target_height)
+            new_w, new_h = img.size
             if (orig_w, orig_h) != (new_w, new_h):
-                self.console.print(
+                log(
                     f"  [dim]Resized: {orig_w}x{orig_h} -> {new_w}x{new_h}[/dim]"
                 )
 
             # Apply chroma key transparency (white background -> transparent)
             if logo_type.bg_type:
-                chroma_key_transparency(output_path, color="white")
+                img = chroma_key(img, color="white")
 
-            dimensions = get_image_dimensions(output_path)
-            has_alpha = has_alpha_channel(output_path)
-            self.console.print(
+            quantized = self._save_asset(img, output_path, log)
+
+            dimensions = img.size
+            has_alpha = has_alpha_channel(img)
+            log(
                 f"  [green]✓[/green] {output_path.name} "
                 f"({dimensions[0]}x{dimensions[1]})"
             )
@@ -406,11 +479,12 @@ class AssetGenerator:
                 output_path=output_path,
                 dimensions=dimensions,
                 has_alpha=has_alpha,
+                quantized=quantized,
             )
 
         except GeminiAPIError as e:
-            self.console.print(f"  [red]✗[/red] API error: {e}")
+            log(f"  [red]✗[/red] API error: {e}")
             return None
         except Exception as e:
-            self.console.print(f"  [red]✗[/red] Error: {e}")
+            log(f"  [red]✗[/red] Error: {e}")
             return None
@@ -4,24 +4,12 @@ These prompts use user-provided reference images for accurate reproduction.
 """
 
 from dataclasses import dataclass
+from functools import lru_cache
+from typing import Final
 
-
-@dataclass
-class AssetPrompts:
-    """Prompt templates optimized for Nano Banana Pro (Gemini 3 Pro Image).
-
-    These prompts are designed to work with user-provided reference images
-    to generate accurate platform assets.
-    """
-
-    @staticmethod
-    def device(platform_name: str) -> str:
-        """Generate prompt for device/console image.
-
-        The user provides a reference image (platform.jpg) showing the actual hardware.
-        This prompt instructs the model to recreate it as a nostalgic gaming setup.
-        """
-        return f"""Generate a nostalgic gaming setup image for the {platform_name} based on the reference image provided.
+# Prompt bodies are module constants compiled once; each call only fills in
+# the {platform_name} placeholders, and rendered prompts are cached per platform
+DEVICE_PROMPT_TEMPLATE: Final = """Generate a nostalgic gaming setup image for the {platform_name} based on the reference image provided.
 
 The reference image shows the {platform_name} hardware. Create a complete gaming setup composition in the style of retro gaming nostalgia art.
 
@@ -53,14 +41,7 @@ CRITICAL - BACKGROUND REQUIREMENT:
 - SHARP HARD EDGES between objects and the white background - NO blur, NO feathering
 - NO shadows on the background - the white must be clean and uniform"""
 
-    @staticmethod
-    def logo(platform_name: str) -> str:
-        """Generate prompt for logo image.
-
-        The user provides a reference image (logo.png) showing the actual logo.
-        This prompt instructs the model to recreate it cleanly.
-        """
-        return f"""Reproduce the {platform_name} logo exactly as shown in the reference image.
+LOGO_PROMPT_TEMPLATE: Final = """Reproduce the {platform_name} logo exactly as shown in the reference image.
 
 The reference image shows the official {platform_name} logo. Recreate this EXACTLY.
 
@@ -89,9 +70,42 @@ CRITICAL BACKGROUND REQUIREMENT:
 - This is for transparency extraction - clean edges are essential"""
 
 
-@dataclass
+@dataclass(slots=True)
+class AssetPrompts:
+    """Prompt templates optimized for Nano Banana Pro (Gemini 3 Pro Image).
+
+    These prompts are designed to work with user-provided reference images
+    to generate accurate platform assets.
+    """
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def device(platform_name: str) -> str:
+        """Generate prompt for device/console image.
+
+        The user provides a reference image (platform.jpg) showing the actual hardware.
+        This prompt instructs the model to recreate it as a nostalgic gaming setup.
+        """
+        return DEVICE_PROMPT_TEMPLATE.format(platform_name=platform_name)
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def logo(platform_name: str) -> str:
+        """Generate prompt for logo image.
+
+        The user provides a reference image (logo.png) showing the actual logo.
+        This prompt instructs the model to recreate it cleanly.
+        """
+        return LOGO_PROMPT_TEMPLATE.format(platform_name=platform_name)
+
+
+@dataclass(frozen=True, slots=True)
 class AssetType:
-    """Asset type configuration."""
+    """Asset type configuration.
+
+    Instances are cached and shared by get_device_type/get_logo_type, so they
+    are immutable.
+    """
 
     name: str
     aspect_ratio: str
@@ -102,6 +116,7 @@ class AssetType:
     output_filename: str
 
 
+@lru_cache(maxsize=16)
 def get_device_type(
     width: int = 2160,
     height: int = 2160,
@@ -118,6 +133,7 @@ def get_device_type(
     )
 
 
+@lru_cache(maxsize=16)
 def get_logo_type(
     width: int = 1920,
     height: int = 510,
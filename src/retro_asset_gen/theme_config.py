@@ -6,15 +6,28 @@ that define how generated assets should be deployed to theme folders.
 
 from __future__ import annotations
 
+import os
+from collections.abc import Iterator
+from dataclasses import dataclass, fields
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
 
-import yaml
 from pydantic import BaseModel, Field, field_validator
 
 
-class ThemeFiles(BaseModel):
-    """File mappings for a theme."""
+@lru_cache(maxsize=128)
+def _assets_path(base_path: str, assets_dir: str, platform_id: str) -> Path:
+    """Format and build a platform's assets path, cached per argument triple."""
+    return Path(base_path) / assets_dir.format(platform_id=platform_id)
+
+
+@dataclass(frozen=True, slots=True)
+class ThemeFiles:
+    """File mappings for a theme.
+
+    A plain dataclass: it has no validators of its own, and pydantic still
+    validates it (from a dict) as the ThemeConfig.files field.
+    """
 
     device: str = "device.png"
     logo_dark_color: str = "logo_dark_color.png"
@@ -23,12 +36,19 @@ class ThemeFiles(BaseModel):
     logo_light_white: str = "logo_light_white.png"
 
 
+# Valid asset_type names for ThemeConfig.get_file_path, fixed by the schema
+ASSET_TYPES: frozenset[str] = frozenset(f.name for f in fields(ThemeFiles))
+
+# ThemeFiles is immutable, so every theme without a files section shares one
+_DEFAULT_THEME_FILES = ThemeFiles()
+
+
 class ThemeConfig(BaseModel):
     """Configuration for a single theme."""
 
     base_path: str
     assets_dir: str = "assets/{platform_id}"
-    files: ThemeFiles = Field(default_factory=ThemeFiles)
+    files: ThemeFiles = _DEFAULT_THEME_FILES
 
     @field_validator("base_path")
     @classmethod
@@ -45,8 +65,7 @@ class ThemeConfig(BaseModel):
         Returns:
             Full path to the platform's assets directory.
         """
-        assets_dir = self.assets_dir.format(platform_id=platform_id)
-        return Path(self.base_path) / assets_dir
+        return _assets_path(self.base_path, self.assets_dir, platform_id)
 
     def get_file_path(self, platform_id: str, asset_type: str) -> Path:
         """Get the full path for a specific asset file.
@@ -61,11 +80,12 @@ class ThemeConfig(BaseModel):
         Raises:
             ValueError: If asset_type is invalid.
         """
-        assets_path = self.get_assets_path(platform_id)
-        file_name: str | None = getattr(self.files, asset_type, None)
-        if file_name is None:
+        # Reject unknown types before building any path; after that the name
+        # is a ThemeFiles field, so read it straight off the current files
+        if asset_type not in ASSET_TYPES:
             raise ValueError(f"Unknown asset type: {asset_type}")
-        return assets_path / file_name
+        file_name: str = getattr(self.files, asset_type)
+        return self.get_assets_path(platform_id) / file_name
 
 
 class ThemesConfig(BaseModel):
@@ -99,6 +119,17 @@ class ThemeConfigError(Exception):
     pass
 
 
+# Parsed configs keyed by (path, mtime_ns, size), so an unchanged file is only
+# parsed and validated once per process
+_CONFIG_CACHE: dict[tuple[str, int, int], ThemesConfig] = {}
+
+
+def clear_themes_config_cache() -> None:
+    """Forget all configs cached by load_themes_config and candidate locations."""
+    _CONFIG_CACHE.clear()
+    _cached_themes_config_candidates.cache_clear()
+
+
 def find_themes_config() -> Path | None:
     """Find the themes.yaml configuration file.
 
@@ -107,29 +138,47 @@ def find_themes_config() -> Path | None:
     2. Project root (looking for pyproject.toml)
     3. ~/.config/retro-asset-gen/
 
+    The candidate list is cached per working directory for the life of the
+    process, but which candidates exist is checked on every call, so a
+    deleted or newly created themes.yaml is picked up.
+    clear_themes_config_cache() forces a fresh walk for the project root.
+
     Returns:
         Path to themes.yaml if found, None otherwise.
     """
+    # Candidates are plain strings checked with os.path; only the match
+    # becomes a Path
+    for candidate in _cached_themes_config_candidates(os.getcwd()):
+        if os.path.exists(candidate):
+            return Path(candidate)
+    return None
+
+
+@lru_cache(maxsize=4)
+def _cached_themes_config_candidates(cwd: str) -> tuple[str, ...]:
+    """All themes.yaml candidates for cwd, in search order."""
+    return tuple(_themes_config_candidates(cwd))
+
+
+def _themes_config_candidates(cwd: str) -> Iterator[str]:
+    """Yield themes.yaml locations in search order.
+
+    Each directory of the parent walk is checked at most once.
+    """
     # Check current directory
-    cwd = Path.cwd()
-    if (cwd / "themes.yaml").exists():
-        return cwd / "themes.yaml"
+    yield os.path.join(cwd, "themes.yaml")
 
     # Look for project root by finding pyproject.toml
-    current = cwd
-    while current != current.parent:
-        if (current / "pyproject.toml").exists():
-            if (current / "themes.yaml").exists():
-                return current / "themes.yaml"
+    current, parent = cwd, os.path.dirname(cwd)
+    while current != parent:
+        if os.path.exists(os.path.join(current, "pyproject.toml")):
+            if current != cwd:  # Already checked above
+                yield os.path.join(current, "themes.yaml")
             break
-        current = current.parent
+        current, parent = parent, os.path.dirname(parent)
 
     # Check user config directory
-    user_config = Path.home() / ".config" / "retro-asset-gen" / "themes.yaml"
-    if user_config.exists():
-        return user_config
-
-    return None
+    yield os.path.join(os.path.expanduser("~"), ".config", "retro-asset-gen", "themes.yaml")
 
 
 def load_themes_config(path: Path | None = None) -> ThemesConfig:
@@ -140,7 +189,8 @@ def load_themes_config(path: Path | None = None) -> ThemesConfig:
               If not provided, searches standard locations.
 
     Returns:
-        ThemesConfig instance.
+        ThemesConfig instance. Repeat loads of an unchanged file return the
+        cached instance.
 
     Raises:
         ThemeConfigError: If config cannot be loaded or parsed.
@@ -154,12 +204,25 @@ def load_themes_config(path: Path | None = None) -> ThemesConfig:
             "~/.config/retro-asset-gen/themes.yaml"
         )
 
-    if not path.exists():
-        raise ThemeConfigError(f"Themes config not found: {path}")
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        raise ThemeConfigError(f"Themes config not found: {path}") from None
+
+    cache_key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    cached = _CONFIG_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Imported here so commands that never touch themes.yaml don't load PyYAML
+    import yaml
+
+    # Prefer the libyaml C bindings when PyYAML was built with them
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
     try:
-        with path.open("r") as f:
-            data = yaml.safe_load(f)
+        # Bytes go straight to the parser, which detects the encoding itself
+        data = yaml.load(path.read_bytes(), Loader=loader)
     except yaml.YAMLError as e:
         raise ThemeConfigError(f"Invalid YAML in themes config: {e}") from e
 
@@ -167,10 +230,29 @@ def load_themes_config(path: Path | None = None) -> ThemesConfig:
         data = {}
 
     try:
-        return ThemesConfig.model_validate(data)
+        config = ThemesConfig.model_validate(data)
     except Exception as e:
         raise ThemeConfigError(f"Invalid themes config format: {e}") from e
 
+    _CONFIG_CACHE[cache_key] = config
+    return config
+
+
+# Default themes.yaml, stored exactly as yaml.dump emits it so creating the
+# file needs no dict building or YAML serialization
+_DEFAULT_THEMES_YAML = """\
+themes:
+  colorful:
+    base_path: /Volumes/RETRO/frontends/Pegasus_mac/themes/COLORFUL
+    assets_dir: assets/images/{platform_id}
+    files:
+      device: device.png
+      logo_dark_color: logo_dark_color.png
+      logo_dark_black: logo_dark_black.png
+      logo_light_color: logo_light_color.png
+      logo_light_white: logo_light_white.png
+"""
+
 
 def create_default_themes_config(path: Path) -> None:
     """Create a default themes.yaml configuration file.
@@ -178,22 +260,5 @@ def create_default_themes_config(path: Path) -> None:
     Args:
         path: Path where to create the config file.
     """
-    default_config: dict[str, Any] = {
-        "themes": {
-            "colorful": {
-                "base_path": "/Volumes/RETRO/frontends/Pegasus_mac/themes/COLORFUL",
-                "assets_dir": "assets/images/{platform_id}",
-                "files": {
-                    "device": "device.png",
-                    "logo_dark_color": "logo_dark_color.png",
-                    "logo_dark_black": "logo_dark_black.png",
-                    "logo_light_color": "logo_light_color.png",
-                    "logo_light_white": "logo_light_white.png",
-                },
-            }
-        }
-    }
-
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w") as f:
-        yaml.dump(default_config, f, default_flow_style=False, sort_keys=False)
+    path.write_text(_DEFAULT_THEMES_YAML)
@@ -0,0 +1,36 @@
+"""Tests for image processing utilities."""
+
+import numpy as np
+from PIL import Image
+
+from retro_asset_gen.image_processor import extract_alpha
+
+
+def _reference_alpha(white: np.ndarray, black: np.ndarray) -> np.ndarray:
+    """Difference matte alpha computed in float64, as the original per-pixel loop did."""
+    diff = white.astype(np.int64) - black.astype(np.int64)
+    pixel_dist = np.sqrt((diff * diff).sum(axis=-1))
+    alpha = np.clip(1.0 - pixel_dist / np.sqrt(3 * 255 * 255), 0.0, 1.0)
+    return (alpha * 255).astype(np.uint8)
+
+
+def test_extract_alpha_matches_float64_on_every_difference_level() -> None:
+    levels = np.arange(256, dtype=np.uint8)
+    white = np.repeat(levels[np.newaxis, :, np.newaxis], 3, axis=2)
+    black = np.zeros_like(white)
+
+    result, _ = extract_alpha(Image.fromarray(white), Image.fromarray(black))
+
+    np.testing.assert_array_equal(np.asarray(result)[..., 3], _reference_alpha(white, black))
+
+
+def test_extract_alpha_matches_float64_on_a_random_matte() -> None:
+    rng = np.random.default_rng(0)
+    alpha = rng.random((64, 64, 1))
+    foreground = rng.integers(0, 256, (64, 64, 3))
+    white = np.round(foreground * alpha + 255 * (1 - alpha)).astype(np.uint8)
+    black = np.round(foreground * alpha).astype(np.uint8)
+
+    result, _ = extract_alpha(Image.fromarray(white), Image.fromarray(black))
+
+    np.testing.assert_array_equal(np.asarray(result)[..., 3], _reference_alpha(white, black))